@@ -1,429 +1,975 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
-import json
-import time
+import array
+import functools
+import re
+from collections import deque
 
 # === CPU STATE ===
 class CPUState:
+    __slots__ = ('registers', 'memory', 'PC', 'IR', 'MAR', 'MDR',
+                 'Z', 'N', 'C', 'V', 'instruction_history', 'current_line',
+                 'modified_registers', 'modified_memory', 'animation_active')
+
     def __init__(self):
-        self.registers = [0] * 8
-        self.memory = [0] * 64
-        self.special_registers = {
-            'PC': 0,
-            'IR': '',
-            'MAR': 0,
-            'MDR': 0,
-            'FLAGS': {'Z': 0, 'N': 0, 'C': 0, 'V': 0}
-        }
-        self.instruction_history = []
+        # Registers and memory hold unsigned bytes
+        self.registers = bytearray(8)
+        self.memory = bytearray(64)
+        # Special registers
+        self.PC = 0
+        self.IR = ''
+        self.MAR = 0
+        self.MDR = 0
+        # Condition flags
+        self.Z = 0
+        self.N = 0
+        self.C = 0
+        self.V = 0
+        # Only the last 8 instructions are shown in the Control Signals panel
+        self.instruction_history = deque(maxlen=8)
         self.current_line = 0
-        self.modified_registers = set()
-        self.modified_memory = set()
+        # Bitmasks of the registers/memory cells the last execution wrote
+        self.modified_registers = 0
+        self.modified_memory = 0
         self.animation_active = False
         
-    def copy(self):
-        state = CPUState()
-        state.registers = self.registers.copy()
-        state.memory = self.memory.copy()
-        state.special_registers = {
-            'PC': self.special_registers['PC'],
-            'IR': self.special_registers['IR'],
-            'MAR': self.special_registers['MAR'],
-            'MDR': self.special_registers['MDR'],
-            'FLAGS': self.special_registers['FLAGS'].copy()
-        }
-        state.instruction_history = self.instruction_history.copy()
-        state.current_line = self.current_line
+    def snapshot(self):
+        """Return an immutable record of the state, used for undo/redo"""
+        return (bytes(self.registers), bytes(self.memory),
+                self.PC, self.IR, self.MAR, self.MDR,
+                self.Z, self.N, self.C, self.V,
+                tuple(self.instruction_history), self.current_line)
+
+    @classmethod
+    def from_snapshot(cls, snap):
+        """Build a fresh state from a snapshot() record"""
+        state = cls()
+        (registers, memory, state.PC, state.IR, state.MAR, state.MDR,
+         state.Z, state.N, state.C, state.V,
+         history, state.current_line) = snap
+        state.registers[:] = registers
+        state.memory[:] = memory
+        state.instruction_history.extend(history)
         return state
     
     def update_flags(self, result, original_result=None):
         """Update FLAGS based on operation result"""
+        _dirty_special.add('FLAGS')
+
         # Z flag: set if result is zero
-        self.special_registers['FLAGS']['Z'] = 1 if result == 0 else 0
+        self.Z = 1 if result == 0 else 0
         
-        # N flag: set if result is negative (bit 7 set in 8-bit)
-        self.special_registers['FLAGS']['N'] = 1 if result & 0x80 else 0
+        # N flag: set if result is negative (bit 7 of the 8-bit result,
+        # shifted straight down instead of tested)
+        self.N = result >> 7
         
         # C flag: set if carry occurred (result > 255 or < 0)
-        if original_result is not None:
-            self.special_registers['FLAGS']['C'] = 1 if original_result > 255 or original_result < 0 else 0
-        
         # V flag: overflow (simplified - would need more context for proper implementation)
-        # For now, set if result wrapped around
+        # For now, set if result wrapped around. result is original_result
+        # masked to 8 bits, so both reduce to "the mask changed the value"
         if original_result is not None:
-            self.special_registers['FLAGS']['V'] = 1 if original_result != result else 0
+            self.C = self.V = 1 if original_result != result else 0
 
 cpu_state = CPUState()
-state_history = []  # For undo/redo
+# Snapshots for undo/redo; the undo ring drops its oldest entry itself once
+# it holds 50
+state_history = deque(maxlen=50)
 redo_stack = []
 dark_mode = False
 execution_speed = 500  # milliseconds
 
+def build_theme(dark):
+    """Colours for the light or dark theme"""
+    return {
+        'bg': "#1e1e1e" if dark else "#ffffff",
+        'fg': "#ffffff" if dark else "#000000",
+        # Bus labels and special register cells
+        'label_bg': "#2d2d2d" if dark else "#ffffff",
+        'highlight': "#ffc107" if dark else "#ffeb3b",
+        'current_line': "#1976d2" if dark else "#90caf9",
+        'button_bg': "#424242" if dark else "#e0e0e0",
+        'button_active': "#616161" if dark else "#d0d0d0",
+        # Editor syntax tag foregrounds
+        'syntax': {
+            'keyword': "#bb86fc" if dark else "#0000ff",
+            'register': "#03dac6" if dark else "#008000",
+            'number': "#ffa726" if dark else "#ff6600",
+            'address': "#4fc3f7" if dark else "#1976d2",
+            'comment': "#666666" if dark else "#999999",
+        },
+    }
+
+# Both palettes are built once; toggling dark mode just swaps THEME
+LIGHT_THEME = build_theme(False)
+DARK_THEME = build_theme(True)
+THEME = DARK_THEME if dark_mode else LIGHT_THEME
+
+# Cells that changed since the last update_gui, and the text last written to
+# each label, so a refresh only talks to Tk for cells that actually changed
+_dirty_registers = set(range(8))
+_dirty_memory = set(range(64))
+_reg_text_cache = [None] * 8
+_mem_text_cache = [None] * 64
+_control_text_cache = [None] * 8
+_bus_text_cache = dict.fromkeys(('Address Bus', 'Data Bus', 'Control Bus'))
+# Special register cells (and the buses fed from them) written since the
+# last update_gui
+SPECIAL_KEYS = ('PC', 'IR', 'MAR', 'MDR', 'FLAGS')
+_dirty_special = set(SPECIAL_KEYS)
+# Z, N, C and V packed into four bits as of the last FLAGS redraw
+_prev_flags_int = None
+# Editor line carrying the current_line tag (edits may drop the tag)
+_tagged_current_line = None
+
+# (canvas, rectangle) cells currently showing the "just modified" colour,
+# and the pending after() that restores them
+_highlighted = []
+_clear_highlights_id = None
+
+# Whether a bus pulse is waiting for its single restore callback
+_animating = False
+
+# Set while a Next or Run is ticking through root.after; cleared by Stop
+_running = False
+_run_iterations = 0
+# The pending after() that continues the run, cancelled by Stop so a quick
+# Stop and restart cannot leave two chains ticking
+_run_after_id = None
+# The pending display refresh of a Run
+_run_refresh_id = None
+# Instructions a Run executes per callback, and the display refresh period
+RUN_SLICE = 1000
+RUN_REFRESH_MS = 33
+
+# Bumped whenever CPU state (or its presentation) changes; update_gui skips
+# the refresh entirely when nothing happened since the last one it rendered
+_state_epoch = 0
+_last_rendered_epoch = -1
+
+# Display strings for every byte value, so refreshes never call str()
+_STR256 = tuple(str(i) for i in range(256))
+
+# Editor content split into lines (raw, and stripped for the program), its
+# compiled program (with its errors) and assembled tape; all are reset by the
+# <<Modified>> binding
+_editor_lines_cache = None
+_line_cache = None
+_program_cache = None
+_tape_cache = None
+# Program lines the last compile ran on, and its result; an edit that leaves
+# the program text as it was (undoing a typo, reloading the same file) reuses
+# it instead of recompiling
+_compiled_lines = None
+_compiled_result = None
+
 # === Instruction Execution Engine ===
-def execute_instruction(instruction, line_num=None):
+# Opcode ids, used to index _HANDLERS and stored in the assembled tape;
+# OP_NONE marks tape slots of lines without an instruction
+(OP_LOAD, OP_STORE, OP_MOV, OP_ADD, OP_SUB, OP_MUL, OP_INC, OP_DEC, OP_CMP,
+ OP_JMP, OP_JZ, OP_JNZ, OP_JC, OP_JN, OP_NOP) = range(15)
+OP_NONE = -1
+
+OPCODE_IDS = {
+    'LOAD': OP_LOAD, 'STORE': OP_STORE, 'MOV': OP_MOV,
+    'ADD': OP_ADD, 'SUB': OP_SUB, 'MUL': OP_MUL,
+    'INC': OP_INC, 'DEC': OP_DEC, 'CMP': OP_CMP,
+    'JMP': OP_JMP, 'JZ': OP_JZ, 'JNZ': OP_JNZ, 'JC': OP_JC, 'JN': OP_JN,
+    'NOP': OP_NOP
+}
+
+# Canonical mnemonic for each usual spelling (LOAD, load, Load), so the
+# decoder normalizes case with one dict lookup; only oddly mixed case falls
+# back to str.upper()
+_OP_INTERN = {spelling: op for op in OPCODE_IDS
+              for spelling in (op, op.lower(), op.capitalize())}
+
+def normalize_op(token):
+    """Upper-case mnemonic for a source token"""
+    return _OP_INTERN.get(token) or token.upper()
+
+# Bounds checking helpers
+def check_register(reg_str):
+    # Fast path for the common R0-R7 spelling: index straight from the digit
+    if len(reg_str) == 2 and reg_str[0] == 'R' and '0' <= reg_str[1] <= '7':
+        return ord(reg_str[1]) - 48
+    if not reg_str.startswith('R') or not reg_str[1:].isdigit():
+        raise ValueError(f"Invalid register: {reg_str}")
+    reg = int(reg_str[1:])
+    if reg < 0 or reg > 7:
+        raise ValueError(f"Register {reg_str} out of bounds (0-7)")
+    return reg
+
+def parse_immediate(text):
+    """Parse a LOAD value: plain decimal, or a 0x/0o/0b prefixed literal"""
+    if text.isdigit():
+        return int(text)
     try:
-        cpu_state.modified_registers.clear()
-        cpu_state.modified_memory.clear()
-        
-        # Remove comments from instruction
-        if ';' in instruction:
-            instruction = instruction[:instruction.index(';')]
-        if '#' in instruction:
-            instruction = instruction[:instruction.index('#')]
-        
-        tokens = instruction.strip().split()
-        if len(tokens) < 1:
-            return True
-
-        op = tokens[0].upper()
-        operands = []
-        if len(tokens) > 1:
-            # Join the rest and split by comma, preserving spaces within operands
-            operands = [operand.strip() for operand in ' '.join(tokens[1:]).split(',')]
-
-        # Bounds checking helper
-        def check_register(reg_str):
-            if not reg_str.startswith('R') or not reg_str[1:].isdigit():
-                raise ValueError(f"Invalid register: {reg_str}")
-            reg = int(reg_str[1:])
-            if reg < 0 or reg > 7:
-                raise ValueError(f"Register {reg_str} out of bounds (0-7)")
-            return reg
-        
-        def check_memory(addr):
-            if addr < 0 or addr >= 64:
-                raise ValueError(f"Memory address {addr} out of bounds (0-63)")
-            return addr
-
-        if op == 'LOAD':
-            if len(operands) != 2:
-                raise ValueError(f"'{op}' requires 2 operands")
-            reg = check_register(operands[0])
-            value = int(operands[1], 0)
-            cpu_state.special_registers['MAR'] = cpu_state.special_registers['PC']
-            cpu_state.special_registers['MDR'] = value
-            cpu_state.registers[reg] = value % 256
-            cpu_state.modified_registers.add(reg)
-            cpu_state.update_flags(cpu_state.registers[reg])
-
-        elif op == 'STORE':
-            if len(operands) != 2:
-                raise ValueError(f"'{op}' requires 2 operands")
-            reg = check_register(operands[0])
-            address = check_memory(int(operands[1]))
-            value = cpu_state.registers[reg] % 256
-            cpu_state.memory[address] = value
-            cpu_state.special_registers['MAR'] = address
-            cpu_state.special_registers['MDR'] = value
-            cpu_state.modified_memory.add(address)
-
-        elif op == 'MOV':
-            if len(operands) != 2:
-                raise ValueError(f"'{op}' requires 2 operands")
-            reg = check_register(operands[0])
-            src = check_register(operands[1])
-            cpu_state.registers[reg] = cpu_state.registers[src] % 256
-            cpu_state.modified_registers.add(reg)
-            cpu_state.update_flags(cpu_state.registers[reg])
-
-        elif op in ['ADD', 'SUB', 'MUL']:
-            if len(operands) == 2:
-                reg = check_register(operands[0])
-                src = check_register(operands[1])
-                if op == 'ADD':
-                    original = cpu_state.registers[reg] + cpu_state.registers[src]
-                    cpu_state.registers[reg] = original % 256
-                elif op == 'SUB':
-                    original = cpu_state.registers[reg] - cpu_state.registers[src]
-                    cpu_state.registers[reg] = original % 256
-                elif op == 'MUL':
-                    original = cpu_state.registers[reg] * cpu_state.registers[src]
-                    cpu_state.registers[reg] = original % 256
-                cpu_state.modified_registers.add(reg)
-                cpu_state.update_flags(cpu_state.registers[reg], original)
-            elif len(operands) == 3:
-                dest = check_register(operands[0])
-                src1 = check_register(operands[1])
-                src2 = check_register(operands[2])
-                if op == 'ADD':
-                    original = cpu_state.registers[src1] + cpu_state.registers[src2]
-                elif op == 'SUB':
-                    original = cpu_state.registers[src1] - cpu_state.registers[src2]
-                elif op == 'MUL':
-                    original = cpu_state.registers[src1] * cpu_state.registers[src2]
-                cpu_state.registers[dest] = original % 256
-                cpu_state.modified_registers.add(dest)
-                cpu_state.update_flags(cpu_state.registers[dest], original)
+        return int(text, 0)
+    except ValueError:
+        raise ValueError(f"Invalid value: {text}") from None
+
+def parse_number(text, kind):
+    """Parse a decimal address or line number, naming the operand on error"""
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Invalid {kind}: {text}") from None
+
+def check_word(value):
+    """Operands must fit the 32-bit slots of an assembled tape"""
+    if value < -0x80000000 or value > 0x7FFFFFFF:
+        raise ValueError(f"Operand {value} out of range")
+    return value
+
+def check_memory(addr):
+    if addr < 0 or addr >= 64:
+        raise ValueError(f"Memory address {addr} out of bounds (0-63)")
+    return addr
+
+def strip_comment(line):
+    """Drop a trailing ';' or '#' comment from a source line"""
+    return line.partition(';')[0].partition('#')[0]
+
+# A label is a name followed by ':' at the start of a line; jumps may name
+# it instead of a line number
+_LABEL_DEF = re.compile(r'\s*([A-Za-z_]\w*)\s*:')
+_LABEL_NAME = re.compile(r'[A-Za-z_]\w*$')
+_JUMP_OPS = frozenset(('JMP', 'JZ', 'JNZ', 'JC', 'JN'))
+_JUMP_IDS = frozenset(OPCODE_IDS[op] for op in _JUMP_OPS)
+
+def split_label(line):
+    """Split a leading 'name:' off a source line; returns (name or None, rest)"""
+    match = _LABEL_DEF.match(line)
+    if match is None:
+        return None, line
+    return match.group(1), line[match.end():]
+
+def resolve_jump_label(line, labels):
+    """Rewrite a jump to a label as a jump to the labelled line number"""
+    tokens = strip_comment(line).split(None, 1)
+    if len(tokens) < 2 or normalize_op(tokens[0]) not in _JUMP_OPS:
+        return line
+    target = tokens[1].strip()
+    if not _LABEL_NAME.match(target):
+        return line
+    if target not in labels:
+        raise ValueError(f"Unknown label: {target}")
+    return f"{tokens[0]} {labels[target]}"
+
+# === Opcode handlers ===
+# Every handler takes the CPU state plus three integer operand slots (unused
+# slots are 0), so the decoder and the assembled tape share one calling
+# convention and handler bodies work on a local instead of the cpu_state
+# global. Jumps return True when the branch is taken (they set PC themselves).
+def _write_result(state, dest, original):
+    state.registers[dest] = result = original & 0xFF
+    state.modified_registers |= 1 << dest
+    _dirty_registers.add(dest)
+    state.update_flags(result, original)
+
+def _set_zn(state, result):
+    # LOAD and MOV only touch Z and N, so they skip update_flags' carry and
+    # overflow bookkeeping
+    _dirty_special.add('FLAGS')
+    state.Z = 1 if result == 0 else 0
+    state.N = result >> 7
+
+def _op_load(state, reg, value, byte):
+    state.MAR = state.PC
+    state.MDR = value
+    _dirty_special.update(('MAR', 'MDR'))
+    state.registers[reg] = byte
+    state.modified_registers |= 1 << reg
+    _dirty_registers.add(reg)
+    _set_zn(state, byte)
+
+def _op_store(state, reg, address, _):
+    value = state.registers[reg]
+    state.memory[address] = value
+    state.MAR = address
+    state.MDR = value
+    _dirty_special.update(('MAR', 'MDR'))
+    state.modified_memory |= 1 << address
+    # STORE is the only instruction that writes memory, so it queues the
+    # cell for redraw itself
+    _dirty_memory.add(address)
+
+def _op_mov(state, reg, src, _):
+    state.registers[reg] = value = state.registers[src]
+    state.modified_registers |= 1 << reg
+    _dirty_registers.add(reg)
+    _set_zn(state, value)
+
+def _op_add(state, dest, src1, src2):
+    regs = state.registers
+    _write_result(state, dest, regs[src1] + regs[src2])
+
+def _op_sub(state, dest, src1, src2):
+    regs = state.registers
+    _write_result(state, dest, regs[src1] - regs[src2])
+
+def _op_mul(state, dest, src1, src2):
+    regs = state.registers
+    _write_result(state, dest, regs[src1] * regs[src2])
+
+def _op_inc(state, reg, _b, _c):
+    _write_result(state, reg, state.registers[reg] + 1)
+
+def _op_dec(state, reg, _b, _c):
+    _write_result(state, reg, state.registers[reg] - 1)
+
+def _op_cmp(state, reg1, reg2, _):
+    result = state.registers[reg1] - state.registers[reg2]
+    state.update_flags(result & 0xFF, result)
+
+def _branch(state, target):
+    state.PC = target
+    state.current_line = target
+    return True
+
+def _op_jmp(state, target, _b, _c):
+    return _branch(state, target)
+
+def _op_jz(state, target, _b, _c):
+    if state.Z:
+        return _branch(state, target)
+
+def _op_jnz(state, target, _b, _c):
+    if not state.Z:
+        return _branch(state, target)
+
+def _op_jc(state, target, _b, _c):
+    if state.C:
+        return _branch(state, target)
+
+def _op_jn(state, target, _b, _c):
+    if state.N:
+        return _branch(state, target)
+
+def _op_nop(state, _a, _b, _c):
+    pass
+
+OPCODES = {
+    'LOAD': _op_load, 'STORE': _op_store, 'MOV': _op_mov,
+    'ADD': _op_add, 'SUB': _op_sub, 'MUL': _op_mul,
+    'INC': _op_inc, 'DEC': _op_dec, 'CMP': _op_cmp,
+    'JMP': _op_jmp, 'JZ': _op_jz, 'JNZ': _op_jnz, 'JC': _op_jc, 'JN': _op_jn,
+    'NOP': _op_nop
+}
+
+# Handlers indexed by opcode id, for dispatch from decoded/assembled code
+_HANDLERS = [None] * len(OPCODE_IDS)
+for _name, _op_id in OPCODE_IDS.items():
+    _HANDLERS[_op_id] = OPCODES[_name]
+
+# === Operand parsers ===
+# One parser per operand format; each checks the operand count and returns
+# the three integer operand slots
+def _require(op, operands, count):
+    if len(operands) != count:
+        raise ValueError(f"'{op}' requires {count} operand{'s' if count != 1 else ''}")
+
+def _parse_load(op, operands):
+    _require(op, operands, 2)
+    value = check_word(parse_immediate(operands[1]))
+    # The wrapped byte rides along in the third slot so execution needn't mask
+    return (check_register(operands[0]), value, value & 0xFF)
+
+def _parse_store(op, operands):
+    _require(op, operands, 2)
+    return (check_register(operands[0]), check_memory(parse_number(operands[1], "memory address")), 0)
+
+def _parse_reg_reg(op, operands):
+    _require(op, operands, 2)
+    return (check_register(operands[0]), check_register(operands[1]), 0)
+
+def _parse_alu(op, operands):
+    if len(operands) not in (2, 3):
+        raise ValueError(f"'{op}' requires 2 or 3 operands")
+    regs = [check_register(operand) for operand in operands]
+    if len(regs) == 2:
+        # Two-operand form: dest is also the first source
+        return (regs[0], regs[0], regs[1])
+    return tuple(regs)
+
+def _parse_reg(op, operands):
+    _require(op, operands, 1)
+    return (check_register(operands[0]), 0, 0)
+
+def _parse_jump(op, operands):
+    _require(op, operands, 1)
+    return (check_word(parse_number(operands[0], "jump target")), 0, 0)
+
+def _parse_none(op, operands):
+    # NOP ignores anything after the mnemonic
+    return (0, 0, 0)
+
+OPERAND_PARSERS = {
+    'LOAD': _parse_load, 'STORE': _parse_store, 'MOV': _parse_reg_reg,
+    'ADD': _parse_alu, 'SUB': _parse_alu, 'MUL': _parse_alu,
+    'INC': _parse_reg, 'DEC': _parse_reg, 'CMP': _parse_reg_reg,
+    'JMP': _parse_jump, 'JZ': _parse_jump, 'JNZ': _parse_jump, 'JC': _parse_jump, 'JN': _parse_jump,
+    'NOP': _parse_none
+}
+
+# Regexes for the plain spelling of each operand format, so a fresh line is
+# decoded in a single match. Anything they reject (prefixed or signed
+# numbers, malformed operands) goes through the parsers above, which also
+# produce the error messages.
+_REG = r'\s*R([0-7])\s*'
+_NUM = r'\s*([0-9]+)\s*'
+
+def _fast_load(reg, value):
+    value = check_word(int(value))
+    return (int(reg), value, value & 0xFF)
+
+def _fast_store(reg, address):
+    return (int(reg), check_memory(int(address)), 0)
+
+def _fast_reg_reg(reg1, reg2):
+    return (int(reg1), int(reg2), 0)
+
+def _fast_alu(dest, src1, src2):
+    dest = int(dest)
+    if src2 is None:
+        # Two-operand form: dest is also the first source
+        return (dest, dest, int(src1))
+    return (dest, int(src1), int(src2))
+
+def _fast_reg(reg):
+    return (int(reg), 0, 0)
+
+def _fast_jump(target):
+    return (check_word(int(target)), 0, 0)
+
+_FAST_OPERANDS = {}
+for _ops, _pattern, _build in (
+        (('LOAD',), _REG + ',' + _NUM, _fast_load),
+        (('STORE',), _REG + ',' + _NUM, _fast_store),
+        (('MOV', 'CMP'), _REG + ',' + _REG, _fast_reg_reg),
+        (('ADD', 'SUB', 'MUL'), _REG + ',' + _REG + '(?:,' + _REG + ')?', _fast_alu),
+        (('INC', 'DEC'), _REG, _fast_reg),
+        (tuple(_JUMP_OPS), _NUM, _fast_jump)):
+    for _name in _ops:
+        _FAST_OPERANDS[_name] = (re.compile(_pattern).fullmatch, _build)
+
+# Decoding is a pure function of the source line, so repeated lines (loop
+# bodies, re-running the same program) are served from the LRU cache
+def parse_instruction(instruction):
+    """Parse one source line into (op_id, (a, b, c), text); () for blank lines"""
+    instruction = strip_comment(instruction)
+    tokens = instruction.split(None, 1)
+    if not tokens:
+        return ()
+
+    op = normalize_op(tokens[0])
+    parser = OPERAND_PARSERS.get(op)
+    if parser is None:
+        raise ValueError(f"Unknown instruction: {op}")
+
+    rest = tokens[1] if len(tokens) > 1 else ''
+    fast = _FAST_OPERANDS.get(op)
+    if fast is not None:
+        match = fast[0](rest)
+        if match is not None:
+            return (OPCODE_IDS[op], fast[1](*match.groups()), instruction.strip())
+
+    # Everything after the opcode is a comma separated operand list
+    operands = [operand.strip() for operand in rest.split(',')] if rest else []
+    return (OPCODE_IDS[op], parser(op, operands), instruction.strip())
+
+@functools.lru_cache(maxsize=4096)
+def _decode_memo(instruction):
+    # Failures are memoized too, so a bad line is not re-parsed every time
+    # the program is recompiled
+    try:
+        return parse_instruction(instruction), None
+    except ValueError as e:
+        return None, str(e)
+
+def decode_instruction(instruction):
+    """parse_instruction, memoized by source line"""
+    decoded, error = _decode_memo(instruction)
+    if error is not None:
+        raise ValueError(error)
+    return decoded
+
+def compile_program(lines):
+    """Decode every program line once.
+
+    Returns (program, errors). program[i] is the decoded (op_id, args, text)
+    of line i, or None for blank, comment and undecodable lines, so jump
+    targets index it directly. errors maps line numbers to error messages,
+    in line order, and holds every bad line, so Verify reports from it too.
+    Labels are collected in a first pass, so jumps may refer forward.
+    """
+    errors = {}
+    labels = {}
+    bodies = []
+    for line_num, line in enumerate(lines):
+        label, body = split_label(line)
+        if label is not None:
+            if label in labels:
+                errors[line_num] = f"Duplicate label: {label}"
             else:
-                raise ValueError(f"'{op}' requires 2 or 3 operands")
-
-        elif op == 'INC':
-            if len(operands) != 1:
-                raise ValueError(f"'{op}' requires 1 operand")
-            reg = check_register(operands[0])
-            original = cpu_state.registers[reg] + 1
-            cpu_state.registers[reg] = original % 256
-            cpu_state.modified_registers.add(reg)
-            cpu_state.update_flags(cpu_state.registers[reg], original)
-
-        elif op == 'DEC':
-            if len(operands) != 1:
-                raise ValueError(f"'{op}' requires 1 operand")
-            reg = check_register(operands[0])
-            original = cpu_state.registers[reg] - 1
-            cpu_state.registers[reg] = original % 256
-            cpu_state.modified_registers.add(reg)
-            cpu_state.update_flags(cpu_state.registers[reg], original)
-
-        elif op == 'CMP':
-            if len(operands) != 2:
-                raise ValueError(f"'{op}' requires 2 operands")
-            reg1 = check_register(operands[0])
-            reg2 = check_register(operands[1])
-            result = cpu_state.registers[reg1] - cpu_state.registers[reg2]
-            cpu_state.update_flags(result % 256, result)
-
-        elif op == 'JMP':
-            if len(operands) != 1:
-                raise ValueError(f"'{op}' requires 1 operand")
-            target = int(operands[0])
-            cpu_state.special_registers['PC'] = target
-            cpu_state.current_line = target
-            cpu_state.special_registers['IR'] = instruction
-            return True
-
-        elif op == 'JZ':
-            if len(operands) != 1:
-                raise ValueError(f"'{op}' requires 1 operand")
-            if cpu_state.special_registers['FLAGS']['Z'] == 1:
-                target = int(operands[0])
-                cpu_state.special_registers['PC'] = target
-                cpu_state.current_line = target
-                cpu_state.special_registers['IR'] = instruction
-                return True
-
-        elif op == 'JNZ':
-            if len(operands) != 1:
-                raise ValueError(f"'{op}' requires 1 operand")
-            if cpu_state.special_registers['FLAGS']['Z'] == 0:
-                target = int(operands[0])
-                cpu_state.special_registers['PC'] = target
-                cpu_state.current_line = target
-                cpu_state.special_registers['IR'] = instruction
-                return True
-
-        elif op == 'JC':
-            if len(operands) != 1:
-                raise ValueError(f"'{op}' requires 1 operand")
-            if cpu_state.special_registers['FLAGS']['C'] == 1:
-                target = int(operands[0])
-                cpu_state.special_registers['PC'] = target
-                cpu_state.current_line = target
-                cpu_state.special_registers['IR'] = instruction
-                return True
-
-        elif op == 'JN':
-            if len(operands) != 1:
-                raise ValueError(f"'{op}' requires 1 operand")
-            if cpu_state.special_registers['FLAGS']['N'] == 1:
-                target = int(operands[0])
-                cpu_state.special_registers['PC'] = target
-                cpu_state.current_line = target
-                cpu_state.special_registers['IR'] = instruction
-                return True
-
-        elif op == 'NOP':
-            pass
-
-        elif op.startswith(';') or op.startswith('#'):
-            # Comment - skip
-            pass
+                labels[label] = line_num
+        bodies.append(body)
 
+    program = []
+    for line_num, body in enumerate(bodies):
+        if line_num in errors:
+            program.append(None)
+            continue
+        try:
+            source = resolve_jump_label(body, labels)
+            decoded = decode_instruction(source) or None
+            if source is not body:
+                # Keep the label in the text shown in IR and the history
+                decoded = decoded[:2] + (strip_comment(body).strip(),)
+            # A jump may land one past the last line, which halts the program
+            if decoded and decoded[0] in _JUMP_IDS and not 0 <= decoded[1][0] <= len(lines):
+                raise ValueError(f"Jump target {decoded[1][0]} is out of range")
+            program.append(decoded)
+        except ValueError as e:
+            program.append(None)
+            errors[line_num] = str(e)
+    # Duplicate labels were found in the first pass, ahead of decode errors
+    return program, dict(sorted(errors.items()))
+
+def assemble(program):
+    """Flatten a compiled program into a tape of integer operands.
+
+    The tape is stored column-wise as four parallel arrays (op_ids, a, b, c)
+    with one slot per source line, so jump targets index it directly; lines
+    without an instruction hold OP_NONE. Returns (tape, texts), where
+    texts[i] is the source of line i as shown in IR (None for empty slots).
+    """
+    tape = tuple(array.array('i') for _ in range(4))
+    op_ids, arg_a, arg_b, arg_c = tape
+    texts = []
+    for decoded in program:
+        if decoded is None:
+            op_id, (a, b, c), text = OP_NONE, (0, 0, 0), None
         else:
-            raise ValueError(f"Unknown instruction: {op}")
-
-        cpu_state.special_registers['IR'] = instruction
-        cpu_state.special_registers['PC'] += 1
-        return True
-
-    except Exception as e:
-        if line_num is not None:
-            messagebox.showerror("Execution Error", f"Line {line_num + 1}: {str(e)}")
+            op_id, (a, b, c), text = decoded
+        op_ids.append(op_id)
+        arg_a.append(a)
+        arg_b.append(b)
+        arg_c.append(c)
+        texts.append(text)
+    return tape, texts
+
+def _execute_tape(tape, texts, errors, max_steps, follow_jumps=True):
+    """Run up to max_steps instructions of an assembled tape without
+    touching the GUI.
+
+    Next, Run and Step All all execute through this loop, and every
+    instruction is dispatched to its handler in _HANDLERS, so the handlers
+    are the one place instruction semantics live. With follow_jumps,
+    execution starts at current_line and goes wherever PC points, stopping
+    at an undecodable line. Without it (Step All), every instruction on the
+    tape runs once, top to bottom, and jumps only update PC and the current
+    line.
+
+    Returns None when the step budget ran out, '' when the program ran off
+    its end, or the error message of the undecodable line it stopped at.
+    """
+    global _state_epoch
+    state = cpu_state
+    handlers = _HANDLERS
+    op_ids, arg_a, arg_b, arg_c = tape
+    append_history = state.instruction_history.append
+    count = len(op_ids)
+    start = state.current_line
+    # position scans ahead over empty slots; when following jumps, resume is
+    # where the last executed instruction left PC
+    position = resume = start if follow_jumps else 0
+    text = None
+    steps = 0
+    stop = None
+
+    while True:
+        if not 0 <= position < count:
+            stop = ''
+            break
+        op = op_ids[position]
+        if op == OP_NONE:
+            if follow_jumps and position in errors:
+                stop = f"Line {position + 1}: {errors[position]}"
+                break
+            position += 1
+            continue
+        if steps == max_steps:
+            break
+        if not steps:
+            # The highlight shows what this batch wrote
+            state.modified_registers = 0
+            state.modified_memory = 0
+        steps += 1
+        text = texts[position]
+        append_history(text)
+        if follow_jumps:
+            state.PC = position
+        # Jump handlers return True when taken; they set PC themselves
+        if not handlers[op](state, arg_a[position], arg_b[position], arg_c[position]):
+            state.PC += 1
+        if follow_jumps:
+            position = resume = state.PC
         else:
-            messagebox.showerror("Execution Error", str(e))
-        return False
+            position += 1
+
+    if steps:
+        state.IR = text
+        _dirty_special.update(('PC', 'IR'))
+    if follow_jumps:
+        # Running off the end, or a zero-step call, moves the current line
+        # on to where scanning stopped; otherwise the run resumes from where
+        # the last instruction left PC
+        state.current_line = position if stop == '' or (stop is None and not steps) else resume
+    # A call that ran nothing and left the line alone needs no refresh
+    if steps or state.current_line != start:
+        _state_epoch += 1
+    return stop
 
 # === GUI Update Functions ===
+def mark_all_dirty():
+    """Force the next update_gui to redraw every register and memory cell"""
+    global _state_epoch
+    _state_epoch += 1
+    _dirty_registers.update(range(8))
+    _dirty_memory.update(range(64))
+    _dirty_special.update(SPECIAL_KEYS)
+
+def mark_state_changed(old, new):
+    """Queue for redraw only the cells whose value differs between two states.
+    The model is the source of truth, so swapping states (reset, undo, redo)
+    needs no full repaint."""
+    global _state_epoch
+    _state_epoch += 1
+    _dirty_registers.update(i for i, (a, b) in enumerate(zip(old.registers, new.registers)) if a != b)
+    _dirty_memory.update(i for i, (a, b) in enumerate(zip(old.memory, new.memory)) if a != b)
+    _dirty_special.update(SPECIAL_KEYS)
+
+def _clear_highlights():
+    global _clear_highlights_id
+    _clear_highlights_id = None
+    bg = THEME['bg']
+    for canvas, rect in _highlighted:
+        canvas.itemconfigure(rect, fill=bg)
+    _highlighted.clear()
+
 def update_gui():
-    # Update registers with highlighting
-    for i in range(8):
-        value = cpu_state.registers[i]
-        register_labels[i]["text"] = str(value)
-        if i in cpu_state.modified_registers:
-            register_labels[i]["bg"] = "#ffeb3b" if not dark_mode else "#ffc107"
-            root.after(300, lambda lbl=register_labels[i]: lbl.config(bg=get_bg_color()))
-        else:
-            register_labels[i]["bg"] = get_bg_color()
+    global _last_rendered_epoch, _clear_highlights_id, _prev_flags_int
+    if _state_epoch == _last_rendered_epoch:
+        return
+    _last_rendered_epoch = _state_epoch
+    # Everything the refresh touches is bound to locals up front
+    state = cpu_state
+    str256 = _STR256
+    highlighted = _highlighted
+    bg = THEME['bg']
+    highlight = THEME['highlight']
+
+    # Update registers and memory cells touched since the last refresh, with
+    # highlighting
+    grids = ((_dirty_registers, state.registers, state.modified_registers,
+              _reg_text_cache, reg_canvas, reg_items, reg_rects),
+             (_dirty_memory, state.memory, state.modified_memory,
+              _mem_text_cache, mem_canvas, mem_items, mem_rects))
+    for dirty, values, modified, cache, canvas, items, rects in grids:
+        configure = canvas.itemconfigure
+        for i in dirty:
+            text = str256[values[i]]
+            if cache[i] != text:
+                cache[i] = text
+                configure(items[i], text=text)
+            if modified >> i & 1:
+                configure(rects[i], fill=highlight)
+                highlighted.append((canvas, rects[i]))
+            else:
+                configure(rects[i], fill=bg)
+        dirty.clear()
+
+    # One timer fades every highlight set since it was scheduled
+    if highlighted and _clear_highlights_id is None:
+        _clear_highlights_id = root.after(300, _clear_highlights)
     
-    # Update memory with highlighting
-    for i in range(len(cpu_state.memory)):
-        value = cpu_state.memory[i]
-        memory_labels[i]["text"] = str(value)
-        if i in cpu_state.modified_memory:
-            memory_labels[i]["bg"] = "#ffeb3b" if not dark_mode else "#ffc107"
-            root.after(300, lambda lbl=memory_labels[i]: lbl.config(bg=get_bg_color()))
+    # Update the special registers and FLAGS written since the last refresh
+    special = _dirty_special
+    configure = special_canvas.itemconfigure
+    for key in special:
+        if key == 'FLAGS':
+            # Flags are written on most steps but rarely change value
+            z, n, c, v = state.Z, state.N, state.C, state.V
+            bits = z << 3 | n << 2 | c << 1 | v
+            if bits == _prev_flags_int:
+                continue
+            _prev_flags_int = bits
+            text = "Z:%d N:%d C:%d V:%d" % (z, n, c, v)
         else:
-            memory_labels[i]["bg"] = get_bg_color()
+            text = str(getattr(state, key))
+        configure(special_items[key], text=text)
     
-    # Update special registers
-    for k in cpu_state.special_registers:
-        if k == 'FLAGS':
-            continue
-        special_labels[k]["text"] = str(cpu_state.special_registers[k])
-    
-    # Update FLAGS
-    flags_text = ' '.join(f"{k}:{v}" for k, v in cpu_state.special_registers['FLAGS'].items())
-    special_labels['FLAGS']["text"] = flags_text
-    
-    # Update control signals
-    for widget in control_box.winfo_children():
-        widget.destroy()
+    # Update control signals straight from the bounded history deque
+    history = state.instruction_history
+    count = len(history)
+    control_cache = _control_text_cache
+    for idx, lbl in enumerate(control_labels):
+        text = history[idx] if idx < count else ""
+        if control_cache[idx] != text:
+            control_cache[idx] = text
+            lbl["text"] = text
     
-    max_labels = 8
-    display_history = cpu_state.instruction_history[-max_labels:]
-    for idx, instr in enumerate(display_history):
-        row = idx // 4
-        col = idx % 4
-        lbl = tk.Label(control_box, text=instr, width=10, relief="sunken", anchor='w',
-                      bg=get_bg_color(), fg=get_fg_color())
-        lbl.grid(row=row, column=col, padx=2, pady=2, sticky="nsew")
-    
-    # Update buses
-    bus_labels['Address Bus']["text"] = f"Address Bus: {cpu_state.special_registers.get('MAR', '')}"
-    bus_labels['Data Bus']["text"] = f"Data Bus: {cpu_state.special_registers.get('MDR', '')}"
-    bus_labels['Control Bus']["text"] = f"Control Bus: PC={cpu_state.special_registers.get('PC', '')} IR={cpu_state.special_registers.get('IR', '')}"
+    # Update the buses fed by the special registers that were written. The
+    # address and data buses use fixed-width hex (data as its 32-bit two's
+    # complement), so their labels keep one width from step to step
+    changed = []
+    if 'MAR' in special:
+        changed.append(('Address Bus', "Address Bus: 0x%04X" % state.MAR))
+    if 'MDR' in special:
+        changed.append(('Data Bus', "Data Bus: 0x%08X" % (state.MDR & 0xFFFFFFFF)))
+    if 'PC' in special or 'IR' in special:
+        changed.append(('Control Bus', f"Control Bus: PC={state.PC} IR={state.IR}"))
+    bus_cache = _bus_text_cache
+    for name, text in changed:
+        if bus_cache[name] != text:
+            bus_cache[name] = text
+            bus_labels[name].configure(text=text)
+    special.clear()
     
     # Highlight current line
     highlight_current_line()
     
-    # Animate data flow
-    if cpu_state.animation_active:
+    # Animate data flow; at short step delays the pulse would never be seen
+    if state.animation_active and execution_speed >= 200:
         animate_data_flow()
 
 def highlight_current_line():
+    global _tagged_current_line
+    # The tag stays put between refreshes that don't move the line
+    if cpu_state.current_line == _tagged_current_line:
+        return
+    _tagged_current_line = cpu_state.current_line
     instruction_entry.tag_remove("current_line", "1.0", tk.END)
     if cpu_state.current_line > 0:
         line_start = f"{cpu_state.current_line}.0"
         line_end = f"{cpu_state.current_line}.end"
         instruction_entry.tag_add("current_line", line_start, line_end)
-        instruction_entry.tag_config("current_line", background="#90caf9" if not dark_mode else "#1976d2")
 
 def animate_data_flow():
     """Simple animation effect for data flow"""
+    global _animating
+    # A pulse already in flight covers this step too
+    if _animating:
+        return
+    _animating = True
     # This creates a brief visual pulse
-    for lbl in bus_labels.values():
-        original_bg = lbl["bg"]
+    original_bgs = {}
+    for name, lbl in bus_labels.items():
+        original_bgs[name] = lbl["bg"]
         lbl["bg"] = "#4caf50"
-        root.after(200, lambda l=lbl, bg=original_bg: l.config(bg=bg))
+    root.after(200, _end_data_flow, original_bgs)
+
+def _end_data_flow(original_bgs):
+    """Restore all bus labels at once when the pulse ends"""
+    global _animating
+    for name, bg in original_bgs.items():
+        bus_labels[name].config(bg=bg)
+    _animating = False
 
 def save_state():
     """Save current state for undo"""
-    state_history.append(cpu_state.copy())
-    if len(state_history) > 50:  # Limit history
-        state_history.pop(0)
+    state_history.append(cpu_state.snapshot())
     redo_stack.clear()
 
 def on_step():
+    on_stop()
     save_state()
-    instructions = instruction_entry.get("1.0", tk.END).strip().split('\n')
-    for i, instruction in enumerate(instructions):
-        if instruction.strip() and not instruction.strip().startswith(';') and not instruction.strip().startswith('#'):
-            cpu_state.instruction_history.append(instruction.strip())
-            cpu_state.animation_active = True
-            execute_instruction(instruction, i)
+    errors = get_compiled_program()[1]
+    tape, texts = get_program_tape()
+    cpu_state.animation_active = True
+    _execute_tape(tape, texts, errors, len(texts), follow_jumps=False)
+    # One coalesced refresh for the whole batch, queued before any error
+    # dialog so the dialog's own event loop paints the final state
     update_gui()
+    if errors:
+        messagebox.showerror("Execution Error", "\n".join(
+            f"Line {line_num + 1}: {message}" for line_num, message in errors.items()))
+
+def invalidate_editor_caches():
+    """Drop everything derived from the editor content"""
+    global _editor_lines_cache, _line_cache, _program_cache, _tape_cache
+    global _tagged_current_line, _highlighted_lines
+    _editor_lines_cache = None
+    _line_cache = None
+    _program_cache = None
+    _tape_cache = None
+    _tagged_current_line = None
+    _highlighted_lines = []
+
+def _on_text_modified(event=None):
+    """Invalidate the editor caches when the content changes"""
+    # Clearing the flag below fires <<Modified>> again; nothing changed then
+    if not instruction_entry.edit_modified():
+        return
+    invalidate_editor_caches()
+    schedule_highlight()
+    # Re-arm <<Modified>> so it fires again on the next edit
+    instruction_entry.edit_modified(False)
+
+def get_compiled_program():
+    global _program_cache, _compiled_lines, _compiled_result
+    if _program_cache is None:
+        lines = get_program_lines()
+        if lines != _compiled_lines:
+            _compiled_lines = lines
+            _compiled_result = compile_program(lines)
+        _program_cache = _compiled_result
+    return _program_cache
+
+def get_program_tape():
+    global _tape_cache
+    if _tape_cache is None:
+        _tape_cache = assemble(get_compiled_program()[0])
+    return _tape_cache
+
+def get_program_lines():
+    global _line_cache
+    if _line_cache is None:
+        _line_cache = instruction_entry.get("1.0", tk.END).strip().split('\n')
+    return _line_cache
+
+def get_editor_lines():
+    """Raw editor lines, numbered exactly as the Text widget numbers them"""
+    global _editor_lines_cache
+    if _editor_lines_cache is None:
+        _editor_lines_cache = instruction_entry.get("1.0", tk.END).split('\n')
+    return _editor_lines_cache
 
 def on_next():
+    global _running, _run_iterations
+    if _running:
+        return
+    on_stop()
     save_state()
-    instructions = instruction_entry.get("1.0", tk.END).strip().split('\n')
-    max_iterations = 1000  # Prevent infinite loops
-    iterations = 0
-    
-    while cpu_state.current_line < len(instructions) and iterations < max_iterations:
-        instruction = instructions[cpu_state.current_line].strip()
-        if instruction and not instruction.startswith(';') and not instruction.startswith('#'):
-            cpu_state.instruction_history.append(instruction)
-            cpu_state.animation_active = True
-            if not execute_instruction(instruction, cpu_state.current_line):
-                break
-            update_gui()
-            root.update()
-            time.sleep(execution_speed / 1000.0)
-            
-            # Check if PC was modified by jump
-            if cpu_state.current_line != cpu_state.special_registers['PC']:
-                cpu_state.current_line = cpu_state.special_registers['PC']
-                continue
-        
-        cpu_state.current_line += 1
-        iterations += 1
-    
-    if iterations >= max_iterations:
+    _running = True
+    _run_iterations = 0
+    _next_tick(*get_program_tape(), get_compiled_program()[1])
+
+def _next_tick(tape, texts, errors):
+    """Execute one instruction of a Next run, then schedule the following one.
+    Tk handles events between ticks, so the window stays live and Stop works."""
+    global _running, _run_iterations, _run_after_id
+    _run_after_id = None
+    if not _running:
+        return
+
+    # Past the iteration cap, a zero-step call still notices a program that
+    # has ended, so only a live run gets the warning
+    cpu_state.animation_active = True
+    stop = _execute_tape(tape, texts, errors, 1 if _run_iterations < 1000 else 0)
+    # The instruction may also have been the program's last
+    update_gui()
+    if stop is not None:
+        _running = False
+        if stop:
+            messagebox.showerror("Execution Error", stop)
+        return
+    if _run_iterations >= 1000:  # Prevent infinite loops
+        _running = False
         messagebox.showwarning("Execution Stopped", "Maximum iterations reached. Possible infinite loop.")
+        return
+
+    _run_iterations += 1
+    _run_after_id = root.after(execution_speed, _next_tick, tape, texts, errors)
+
+def on_run():
+    """Run the program at full speed, following jumps, until it ends or Stop
+    is pressed. The display refreshes on its own timer, not per instruction."""
+    global _running
+    if _running:
+        return
+    on_stop()
+    save_state()
+    _running = True
+    cpu_state.animation_active = False
+    _run_slice(*get_program_tape(), get_compiled_program()[1])
+    _run_refresh()
+
+def _run_slice(tape, texts, errors):
+    """Execute up to RUN_SLICE instructions of a Run, then yield to Tk"""
+    global _running, _run_after_id
+    _run_after_id = None
+    if not _running:
+        return
+    stop = _execute_tape(tape, texts, errors, RUN_SLICE)
+    if stop is None:
+        # Not after(0): Tk only runs idle handlers, which do all redrawing,
+        # when no timer is due, so a zero-delay chain would starve them
+        _run_after_id = root.after(1, _run_slice, tape, texts, errors)
+        return
+    _running = False
+    if stop:
+        update_gui()
+        messagebox.showerror("Execution Error", stop)
+
+def _run_refresh():
+    """Redraw at RUN_REFRESH_MS intervals while a Run is going, and once more
+    after it stops so the final state is shown"""
+    global _run_refresh_id
+    _run_refresh_id = None
+    update_gui()
+    if _running:
+        _run_refresh_id = root.after(RUN_REFRESH_MS, _run_refresh)
+
+def on_stop():
+    """Stop a Next or Run after the instruction in progress"""
+    global _running, _run_after_id, _run_refresh_id
+    _running = False
+    if _run_after_id is not None:
+        root.after_cancel(_run_after_id)
+        _run_after_id = None
+    if _run_refresh_id is not None:
+        # Do the Run's last refresh now instead of through the timer
+        root.after_cancel(_run_refresh_id)
+        _run_refresh_id = None
+        update_gui()
 
 def on_reset():
     global cpu_state
+    on_stop()
     save_state()
-    cpu_state = CPUState()
+    previous, cpu_state = cpu_state, CPUState()
+    _decode_memo.cache_clear()
+    mark_state_changed(previous, cpu_state)
     update_gui()
 
 def on_undo():
     global cpu_state
+    on_stop()
     if state_history:
-        redo_stack.append(cpu_state.copy())
-        cpu_state = state_history.pop()
+        redo_stack.append(cpu_state.snapshot())
+        previous, cpu_state = cpu_state, CPUState.from_snapshot(state_history.pop())
+        mark_state_changed(previous, cpu_state)
         update_gui()
 
 def on_redo():
     global cpu_state
+    on_stop()
     if redo_stack:
-        state_history.append(cpu_state.copy())
-        cpu_state = redo_stack.pop()
+        state_history.append(cpu_state.snapshot())
+        previous, cpu_state = cpu_state, CPUState.from_snapshot(redo_stack.pop())
+        mark_state_changed(previous, cpu_state)
         update_gui()
 
 def on_verify():
-    instructions = instruction_entry.get("1.0", tk.END).strip().split('\n')
-    valid_ops = ['LOAD', 'STORE', 'MOV', 'ADD', 'SUB', 'MUL', 'INC', 'DEC', 'CMP', 'JMP', 'JZ', 'JNZ', 'JC', 'JN', 'NOP']
-    errors = []
-    
-    for idx, instr in enumerate(instructions):
-        if not instr.strip() or instr.strip().startswith(';') or instr.strip().startswith('#'):
-            continue
-        try:
-            tokens = instr.strip().split()
-            op = tokens[0].upper()
-            if op not in valid_ops:
-                errors.append(f"Line {idx+1}: Invalid operation '{op}'")
-                continue
-
-            operands = []
-            if len(tokens) > 1:
-                operands = [operand.strip() for operand in ' '.join(tokens[1:]).split(',')]
-
-            if op in ['LOAD', 'STORE', 'CMP', 'MOV']:
-                if len(operands) != 2:
-                    errors.append(f"Line {idx+1}: '{op}' needs 2 operands")
-            elif op in ['ADD', 'SUB', 'MUL']:
-                if len(operands) not in [2, 3]:
-                    errors.append(f"Line {idx+1}: '{op}' needs 2 or 3 operands")
-            elif op in ['INC', 'DEC', 'JMP', 'JZ', 'JNZ', 'JC', 'JN']:
-                if len(operands) != 1:
-                    errors.append(f"Line {idx+1}: '{op}' needs 1 operand")
-        except Exception as e:
-            errors.append(f"Line {idx+1}: {str(e)}")
+    # Verification is the compiler's error list; on unchanged text it is
+    # already cached
+    errors = get_compiled_program()[1]
     
     if errors:
-        messagebox.showerror("Verification Errors", "\n".join(errors))
+        messagebox.showerror("Verification Errors", "\n".join(
+            f"Line {line_num + 1}: {message}" for line_num, message in errors.items()))
     else:
         messagebox.showinfo("Verification", "All instructions are valid!")
 
@@ -446,93 +992,105 @@ def load_program():
             content = f.read()
         instruction_entry.delete("1.0", tk.END)
         instruction_entry.insert("1.0", content)
-        apply_syntax_highlighting()
-
-def apply_syntax_highlighting():
-    """Apply syntax highlighting to instruction text"""
-    instruction_entry.tag_remove("keyword", "1.0", tk.END)
-    instruction_entry.tag_remove("register", "1.0", tk.END)
-    instruction_entry.tag_remove("number", "1.0", tk.END)
-    instruction_entry.tag_remove("comment", "1.0", tk.END)
-    instruction_entry.tag_remove("address", "1.0", tk.END)
-    
-    keywords = ['LOAD', 'STORE', 'MOV', 'ADD', 'SUB', 'MUL', 'INC', 'DEC', 'CMP', 'JMP', 'JZ', 'JNZ', 'JC', 'JN', 'NOP']
-    
-    content = instruction_entry.get("1.0", tk.END)
-    lines = content.split('\n')
+        # <<Modified>> is only delivered later, so the caches still hold the
+        # previous file; drop them before highlighting the new text. The
+        # delete also dropped every tag, so no line can be skipped
+        invalidate_editor_caches()
+        apply_syntax_highlighting(full=True)
+
+# One pass per line: the first alternative that matches names the tag. A
+# comment swallows the rest of its line, so nothing inside it is tagged.
+# Keywords come from the opcode table, longest first, so a new instruction
+# is highlighted without touching this pattern.
+KEYWORDS = tuple(sorted(OPCODE_IDS, key=len, reverse=True))
+TOKEN_RE = re.compile(
+    r'(?P<keyword>\b(?:' + '|'.join(KEYWORDS) + r')\b)'
+    r'|(?P<register>\bR[0-7]\b)'
+    r'|(?P<address>\b[0-7]x[0-7]\b)'
+    r'|(?P<number>\b\d+\b)'
+    r'|(?P<comment>[;#].*)',
+    re.IGNORECASE)
+SYNTAX_TAGS = ("keyword", "register", "number", "comment", "address")
+
+# Text each editor line had when it was last tagged (None: not yet), and the
+# pending debounced pass. Every edit forgets it, since Tk may leave text that
+# was replaced by identical text untagged; it only spares scroll passes from
+# re-tagging lines they already did
+_highlighted_lines = []
+_highlight_after_id = None
+# (first, last) fractions the editor was last scrolled to
+_editor_view = None
+
+def schedule_highlight():
+    """Highlight once typing or scrolling pauses instead of on every event"""
+    global _highlight_after_id
+    if _highlight_after_id is not None:
+        root.after_cancel(_highlight_after_id)
+    _highlight_after_id = root.after(30, _run_scheduled_highlight)
+
+def _run_scheduled_highlight():
+    global _highlight_after_id
+    _highlight_after_id = None
+    # Only visible lines that changed since they were tagged are re-tagged
+    apply_syntax_highlighting()
+
+def _on_editor_scroll(first, last):
+    global _editor_view
+    scrollbar.set(first, last)
+    # Tk reports the view after cursor moves and other non-edit keys too;
+    # only an actual scroll can bring untagged lines into view
+    if (first, last) == _editor_view:
+        return
+    _editor_view = (first, last)
+    schedule_highlight()
+
+def apply_syntax_highlighting(full=False):
+    """Apply syntax highlighting to the lines currently in view"""
+    global _highlighted_lines
+    lines = get_editor_lines()
+    # Once lines are added or removed, positions no longer line up with
+    # what was tagged, so start over (only the viewport is retagged anyway)
+    if full or len(_highlighted_lines) != len(lines):
+        _highlighted_lines = [None] * len(lines)
+    tagged = _highlighted_lines
     
-    for line_num, line in enumerate(lines, 1):
-        # Highlight comments
-        if ';' in line or '#' in line:
-            comment_start = line.find(';') if ';' in line else line.find('#')
-            start_idx = f"{line_num}.{comment_start}"
-            end_idx = f"{line_num}.end"
-            instruction_entry.tag_add("comment", start_idx, end_idx)
-        
-        # Highlight keywords
-        for keyword in keywords:
-            if keyword.lower() in line.lower() or keyword in line:
-                start = 0
-                while True:
-                    start = line.upper().find(keyword, start)
-                    if start == -1:
-                        break
-                    end = start + len(keyword)
-                    start_idx = f"{line_num}.{start}"
-                    end_idx = f"{line_num}.{end}"
-                    instruction_entry.tag_add("keyword", start_idx, end_idx)
-                    start = end
-        
-        # Highlight registers
-        import re
-        for match in re.finditer(r'\bR[0-7]\b', line):
-            start_idx = f"{line_num}.{match.start()}"
-            end_idx = f"{line_num}.{match.end()}"
-            instruction_entry.tag_add("register", start_idx, end_idx)
-        
-        # Highlight memory addresses (RxC format)
-        for match in re.finditer(r'\b[0-7]x[0-7]\b', line):
-            start_idx = f"{line_num}.{match.start()}"
-            end_idx = f"{line_num}.{match.end()}"
-            instruction_entry.tag_add("address", start_idx, end_idx)
-        
-        # Highlight numbers
-        for match in re.finditer(r'\b\d+\b', line):
+    first = int(instruction_entry.index("@0,0").split('.')[0])
+    last = int(instruction_entry.index(f"@0,{instruction_entry.winfo_height()}").split('.')[0])
+    for line_num in range(first, min(last, len(lines)) + 1):
+        line = lines[line_num - 1]
+        # Since the last edit, a line that still reads the same as when it
+        # was tagged already carries the right tags
+        if tagged[line_num - 1] == line:
+            continue
+        tagged[line_num - 1] = line
+        line_start = f"{line_num}.0"
+        line_end = f"{line_num}.end"
+        for tag in SYNTAX_TAGS:
+            instruction_entry.tag_remove(tag, line_start, line_end)
+        for match in TOKEN_RE.finditer(line):
             start_idx = f"{line_num}.{match.start()}"
             end_idx = f"{line_num}.{match.end()}"
-            instruction_entry.tag_add("number", start_idx, end_idx)
-    
-    # Configure tag colors
-    if dark_mode:
-        instruction_entry.tag_config("keyword", foreground="#bb86fc")
-        instruction_entry.tag_config("register", foreground="#03dac6")
-        instruction_entry.tag_config("number", foreground="#ffa726")
-        instruction_entry.tag_config("address", foreground="#4fc3f7")
-        instruction_entry.tag_config("comment", foreground="#666666")
-    else:
-        instruction_entry.tag_config("keyword", foreground="#0000ff")
-        instruction_entry.tag_config("register", foreground="#008000")
-        instruction_entry.tag_config("number", foreground="#ff6600")
-        instruction_entry.tag_config("address", foreground="#1976d2")
-        instruction_entry.tag_config("comment", foreground="#999999")
+            instruction_entry.tag_add(match.lastgroup, start_idx, end_idx)
+
+def configure_editor_tags():
+    """Colour the syntax and current-line tags; only needed when the theme changes.
+    Tagged ranges pick up the new colours as they are, so nothing is re-tagged."""
+    for tag, colour in THEME['syntax'].items():
+        instruction_entry.tag_config(tag, foreground=colour)
+    instruction_entry.tag_config("current_line", background=THEME['current_line'])
 
 def toggle_dark_mode():
-    global dark_mode
+    global dark_mode, THEME
     dark_mode = not dark_mode
+    THEME = DARK_THEME if dark_mode else LIGHT_THEME
     apply_theme()
     # Update button text
     dark_mode_btn.config(text="🌙 Dark Mode" if not dark_mode else "☀️ Light Mode")
 
-def get_bg_color():
-    return "#1e1e1e" if dark_mode else "#ffffff"
-
-def get_fg_color():
-    return "#ffffff" if dark_mode else "#000000"
-
 def apply_theme():
-    bg = get_bg_color()
-    fg = get_fg_color()
-    frame_bg = "#2d2d2d" if dark_mode else "#f0f0f0"
+    bg = THEME['bg']
+    fg = THEME['fg']
+    label_bg = THEME['label_bg']
     
     root.config(bg=bg)
     
@@ -544,28 +1102,51 @@ def apply_theme():
     instruction_entry.config(bg=bg, fg=fg, insertbackground=fg)
     
     # Update all labels
-    for lbl in register_labels + memory_labels + list(special_labels.values()) + list(bus_labels.values()):
-        lbl.config(bg=frame_bg if dark_mode else "#ffffff", fg=fg)
+    for lbl in bus_labels.values():
+        lbl.config(bg=label_bg, fg=fg)
+    
+    # Register and memory cell backgrounds are repainted by the update_gui
+    # below; recolour the text, and the special register cells outright
+    for canvas, items in ((reg_canvas, reg_items), (mem_canvas, mem_items),
+                          (special_canvas, special_items.values())):
+        canvas.config(bg=bg)
+        for item in items:
+            canvas.itemconfigure(item, fill=fg)
+    for rect in special_rects:
+        special_canvas.itemconfigure(rect, fill=label_bg)
+    for lbl in control_labels:
+        lbl.config(bg=bg, fg=fg)
     
     # Update label frames
     for frame in [instruction_box, register_box, memory_box, bus_box, control_box, special_box]:
         frame.config(bg=bg, fg=fg)
     
     # Update dark mode button
-    dark_mode_btn.config(
-        bg="#424242" if dark_mode else "#e0e0e0",
-        fg=fg,
-        activebackground="#616161" if dark_mode else "#d0d0d0"
-    )
+    dark_mode_btn.config(bg=THEME['button_bg'], fg=fg,
+                         activebackground=THEME['button_active'])
     
-    apply_syntax_highlighting()
+    configure_editor_tags()
+    mark_all_dirty()
     update_gui()
 
+# Dialog windows are built on first use, then hidden and re-shown instead of
+# being destroyed and rebuilt every time
+speed_window = None
+speed_var = None
+help_window = None
+
 def change_speed():
-    global execution_speed
+    global speed_window, speed_var
+    if speed_window is not None:
+        speed_var.set(execution_speed)
+        speed_window.deiconify()
+        speed_window.lift()
+        return
+
     speed_window = tk.Toplevel(root)
     speed_window.title("Execution Speed")
     speed_window.geometry("300x150")
+    speed_window.protocol("WM_DELETE_WINDOW", speed_window.withdraw)
     
     tk.Label(speed_window, text="Execution Speed (ms):").pack(pady=10)
     
@@ -577,15 +1158,22 @@ def change_speed():
     def apply_speed():
         global execution_speed
         execution_speed = speed_var.get()
-        speed_window.destroy()
+        speed_window.withdraw()
     
     tk.Button(speed_window, text="Apply", command=apply_speed).pack(pady=10)
 
 def show_help():
     """Display help window with all instruction syntax"""
+    global help_window
+    if help_window is not None:
+        help_window.deiconify()
+        help_window.lift()
+        return
+
     help_window = tk.Toplevel(root)
     help_window.title("Help - Instruction Syntax")
     help_window.geometry("700x600")
+    help_window.protocol("WM_DELETE_WINDOW", help_window.withdraw)
     
     # Create a text widget with scrollbar
     help_frame = tk.Frame(help_window)
@@ -705,6 +1293,11 @@ SUPPORTED INSTRUCTIONS AND SYNTAX:
     Description: Does nothing, just increments PC
 
 ================================================================================
+LABELS:
+   A name followed by a colon marks a line; jumps may use it as the target
+   Example: loop: INC R6
+            JNZ loop
+
 COMMENTS:
    Use semicolon (;) or hash (#) for comments
    Example: LOAD R0, 10  ; Load 10 into R0
@@ -735,6 +1328,8 @@ BUTTONS:
    Verify: Check syntax of all instructions
    Step All: Execute all instructions once
    Next: Execute instructions with animation
+   Run: Execute at full speed, following jumps, until Stop
+   Stop: Pause a Next or Run
    Reset: Clear all registers and memory
    Undo: Revert to previous state
    Redo: Restore next state
@@ -748,7 +1343,7 @@ BUTTONS:
     help_text.config(state=tk.DISABLED)  # Make read-only
     
     # Close button
-    close_btn = tk.Button(help_window, text="Close", command=help_window.destroy, width=15)
+    close_btn = tk.Button(help_window, text="Close", command=help_window.withdraw, width=15)
     close_btn.pack(pady=10)
 
 # === GUI Layout ===
@@ -803,65 +1398,99 @@ instruction_box.grid_columnconfigure(0, weight=1)
 
 instruction_entry = tk.Text(instruction_box, height=8, wrap="word", font=("Consolas", 11))
 instruction_entry.grid(row=0, column=0, sticky="nsew")
-instruction_entry.bind("<KeyRelease>", lambda e: apply_syntax_highlighting())
+# Every edit (typing, paste, cut) reports through <<Modified>>, which also
+# schedules the highlighter
+instruction_entry.bind("<<Modified>>", _on_text_modified)
 
 # Add scrollbar
 scrollbar = tk.Scrollbar(instruction_box, command=instruction_entry.yview)
 scrollbar.grid(row=0, column=1, sticky="ns")
-instruction_entry.config(yscrollcommand=scrollbar.set)
+instruction_entry.config(yscrollcommand=_on_editor_scroll)
+instruction_entry.bind("<Configure>", lambda e: schedule_highlight())
 
 register_box = tk.LabelFrame(top_frame, text="Registers", padx=5, pady=5)
 register_box.grid(row=0, column=1, sticky="nsew")
-register_box.grid_columnconfigure(0, weight=1)
-register_box.grid_columnconfigure(1, weight=1)
+register_box.grid_columnconfigure((0, 1), weight=1)
+
+# Registers and memory are drawn as text items over background rectangles on
+# one Canvas each; a refresh reconfigures canvas items instead of Labels
+CELL_FONT = ("Courier", 10)
+HEADER_FONT = ("Courier", 9, "bold")
 
-register_labels = []
-for i in range(8):
-    register_box.grid_rowconfigure(i, weight=1)
-    tk.Label(register_box, text=f"R{i}", width=3, anchor='e').grid(row=i, column=0, sticky="e", padx=2, pady=2)
-    lbl = tk.Label(register_box, text="0", width=8, relief="sunken", anchor='w')
-    lbl.grid(row=i, column=1, sticky="ew", padx=2, pady=2)
-    register_labels.append(lbl)
+def create_cell_grid(parent, rows, cols, row_header, col_header=None,
+                     cell_width=40, cell_height=24, header_width=30):
+    """Build a Canvas holding a rows x cols grid of value cells.
+
+    Returns (canvas, rects, items): the background rectangle and the text
+    item of every cell in row-major order. Headers are drawn once, and the
+    grid is stretched over the canvas whenever it is resized.
+    """
+    header_height = 18 if col_header else 0
+    canvas = tk.Canvas(parent, highlightthickness=0,
+                       width=header_width + cols * cell_width,
+                       height=header_height + rows * cell_height)
+    headers = []  # (item, row, col); -1 marks the header row/column
+    if col_header:
+        for j in range(cols):
+            headers.append((canvas.create_text(0, 0, text=col_header(j), font=HEADER_FONT, fill="#666"), -1, j))
+    for i in range(rows):
+        headers.append((canvas.create_text(0, 0, text=row_header(i), font=HEADER_FONT, fill="#666"), i, -1))
+    rects = []
+    items = []
+    for _ in range(rows * cols):
+        rects.append(canvas.create_rectangle(0, 0, 0, 0, outline="#999999", fill=THEME['bg']))
+        items.append(canvas.create_text(0, 0, text="0", font=CELL_FONT, fill=THEME['fg']))
+
+    def layout(event):
+        width = (event.width - header_width) / cols
+        height = (event.height - header_height) / rows
+        for item, i, j in headers:
+            x = header_width / 2 if j < 0 else header_width + (j + 0.5) * width
+            y = header_height / 2 if i < 0 else header_height + (i + 0.5) * height
+            canvas.coords(item, x, y)
+        for idx, (rect, item) in enumerate(zip(rects, items)):
+            i, j = divmod(idx, cols)
+            x0 = header_width + j * width
+            y0 = header_height + i * height
+            canvas.coords(rect, x0 + 1, y0 + 1, x0 + width - 1, y0 + height - 1)
+            canvas.coords(item, x0 + width / 2, y0 + height / 2)
+
+    canvas.bind("<Configure>", layout)
+    return canvas, rects, items
+
+register_box.grid_rowconfigure(0, weight=1)
+reg_canvas, reg_rects, reg_items = create_cell_grid(
+    register_box, 8, 1, lambda i: f"R{i}", cell_width=80, cell_height=26)
+reg_canvas.grid(row=0, column=0, columnspan=2, sticky="nsew")
 
 # Middle row: Memory and Buses
 memory_box = tk.LabelFrame(root, text="Memory (8x8 Matrix - Use RxC format: Row x Column)", padx=5, pady=5)
 memory_box.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+memory_box.grid_rowconfigure(0, weight=1)
+memory_box.grid_columnconfigure(0, weight=1)
 
-# Add row and column headers
-tk.Label(memory_box, text="", width=2).grid(row=0, column=0)
-for j in range(8):
-    lbl = tk.Label(memory_box, text=f"{j}", width=4, font=("Courier", 9, "bold"), fg="#666")
-    lbl.grid(row=0, column=j+1, sticky="nsew")
-    memory_box.grid_columnconfigure(j+1, weight=1)
-
-memory_labels = []
-for i in range(8):
-    memory_box.grid_rowconfigure(i+1, weight=1)
-    # Row header
-    lbl = tk.Label(memory_box, text=f"{i}", width=2, font=("Courier", 9, "bold"), fg="#666")
-    lbl.grid(row=i+1, column=0, sticky="nsew")
-    
-    for j in range(8):
-        idx = i * 8 + j
-        lbl = tk.Label(memory_box, text="0", width=4, relief="sunken", anchor='center')
-        lbl.grid(row=i+1, column=j+1, padx=1, pady=1, sticky="nsew")
-        memory_labels.append(lbl)
+# Row and column headers are drawn on the canvas with the cells
+mem_canvas, mem_rects, mem_items = create_cell_grid(memory_box, 8, 8, str, str)
+mem_canvas.grid(row=0, column=0, sticky="nsew")
 
 # Buses
 bus_box = tk.LabelFrame(root, text="System Buses", padx=5, pady=5)
 bus_box.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
-bus_box.grid_rowconfigure(0, weight=1)
-bus_box.grid_rowconfigure(1, weight=1)
-bus_box.grid_rowconfigure(2, weight=1)
-bus_box.grid_rowconfigure(3, weight=1)
+# grid row/columnconfigure take a list of indices, so evenly weighted rows
+# and columns are set up with one Tk call
+bus_box.grid_rowconfigure((0, 1, 2, 3), weight=1)
 bus_box.grid_columnconfigure(0, weight=1)
 
 bus_labels = {}
 for idx, bus_name in enumerate(['Address Bus', 'Data Bus', 'Control Bus']):
     lbl = tk.Label(bus_box, text=f"{bus_name}: ", font=("Courier", 10), 
-                  relief="sunken", anchor='w', wraplength=300)
+                  relief="sunken", anchor='w')
     lbl.grid(row=idx, column=0, sticky="nsew", padx=5, pady=5)
     bus_labels[bus_name] = lbl
+# The address and data buses are fixed-width hex, but the control bus shows
+# IR, an arbitrary source line, so it still wraps instead of widening the
+# column
+bus_labels['Control Bus'].config(wraplength=300)
 
 # Dark mode toggle button in bus box
 dark_mode_btn = tk.Button(bus_box, text="🌙 Dark Mode", command=toggle_dark_mode, width=15)
@@ -877,26 +1506,30 @@ bottom_frame.grid_columnconfigure(1, weight=1)
 control_box = tk.LabelFrame(bottom_frame, text="Control Signals", padx=5, pady=5)
 control_box.grid(row=0, column=0, sticky="nsew", padx=(0, 5))
 
+control_box.grid_rowconfigure((0, 1), weight=1)
+control_box.grid_columnconfigure((0, 1, 2, 3), weight=1)
+
+# Fixed 2x4 pool of labels showing the most recent instructions
+control_labels = []
 for i in range(2):
-    control_box.grid_rowconfigure(i, weight=1)
-for j in range(4):
-    control_box.grid_columnconfigure(j, weight=1)
+    for j in range(4):
+        lbl = tk.Label(control_box, text="", width=10, relief="sunken", anchor='w',
+                      bg=THEME['bg'], fg=THEME['fg'])
+        lbl.grid(row=i, column=j, padx=2, pady=2, sticky="nsew")
+        control_labels.append(lbl)
 
 special_box = tk.LabelFrame(bottom_frame, text="Special Registers", padx=5, pady=5)
 special_box.grid(row=0, column=1, sticky="nsew")
 special_box.grid_columnconfigure(0, weight=1)
 special_box.grid_columnconfigure(1, weight=2)
 
-special_labels = {}
-for idx, key in enumerate(['PC', 'IR', 'MAR', 'MDR', 'FLAGS']):
-    special_box.grid_rowconfigure(idx, weight=1)
-    tk.Label(special_box, text=key, width=6, anchor='e').grid(row=idx, column=0, sticky="e", padx=2, pady=2)
-    if key == 'FLAGS':
-        lbl = tk.Label(special_box, text="Z:0 N:0 C:0 V:0", width=20, relief="sunken", anchor='w')
-    else:
-        lbl = tk.Label(special_box, text="0", width=20, relief="sunken", anchor='w')
-    lbl.grid(row=idx, column=1, sticky="ew", padx=2, pady=2)
-    special_labels[key] = lbl
+special_box.grid_rowconfigure(0, weight=1)
+special_canvas, special_rects, special_cells = create_cell_grid(
+    special_box, len(SPECIAL_KEYS), 1, SPECIAL_KEYS.__getitem__,
+    cell_width=170, cell_height=24, header_width=50)
+special_canvas.grid(row=0, column=0, columnspan=2, sticky="nsew")
+special_items = dict(zip(SPECIAL_KEYS, special_cells))
+special_canvas.itemconfigure(special_items['FLAGS'], text="Z:0 N:0 C:0 V:0")
 
 # Buttons
 button_frame = tk.Frame(root)
@@ -906,6 +1539,8 @@ buttons = [
     ("Verify", on_verify),
     ("Step All", on_step),
     ("Next", on_next),
+    ("Run", on_run),
+    ("Stop", on_stop),
     ("Reset", on_reset),
     ("Undo", on_undo),
     ("Redo", on_redo),
@@ -913,8 +1548,8 @@ buttons = [
     ("Save", save_program)
 ]
 
+button_frame.grid_columnconfigure(tuple(range(len(buttons))), weight=1)
 for idx, (text, command) in enumerate(buttons):
-    button_frame.grid_columnconfigure(idx, weight=1)
     btn = tk.Button(button_frame, text=text, command=command, width=10, height=2)
     btn.grid(row=0, column=idx, padx=3, pady=3, sticky="ew")
 
@@ -949,7 +1584,12 @@ JNZ 19
 STORE R6,10  
 """
 
+# Compile the example up front, keyed by the lines get_program_lines will
+# read back, so the first Verify or Step finds it already decoded
+_compiled_lines = example_program.strip().split('\n')
+_compiled_result = compile_program(_compiled_lines)
 instruction_entry.insert("1.0", example_program)
+configure_editor_tags()
 apply_syntax_highlighting()
 
 # Initialize GUI